@@ -15,6 +15,7 @@ GCP_CREDENTIALS_PATH = os.path.join(PROJECT_ROOT, "gcp_credentials.json")
 
 # --- Scraping Config ---
 SEARCH_URL = "https://www.google.com"
+MYNTRA_HOME = "https://www.myntra.com"
 KEYWORDS_PER_BATCH = 40
 
 # --- NEW: CAPTCHA HANDLING CONFIG ---
@@ -23,6 +24,15 @@ CAPTCHA_WAIT_TIMEOUT = 900  # 900 seconds = 15 minutes
 # The interval (in seconds) at which the script checks if the CAPTCHA is gone.
 CAPTCHA_CHECK_INTERVAL = 5  # 5 seconds
 
+# --- PARALLEL PROCESSING CONFIG ---
+# Number of Chrome instances (and worker threads) processing keywords at the same time.
+# The first instance uses CHROME_PROFILE_PATH; extra ones use CHROME_PROFILE_PATH + "_1", "_2", ...
+# because Chrome locks a profile folder to a single running browser.
+# A missing "_N" folder is created as a copy of the master profile, so it starts signed in.
+# After running refresh_profile.py, delete the "_N" folders so they are copied again from the fresh profile.
+# Parallel runs are opt-in: every extra browser searches Google from the same IP at the same time.
+PARALLEL_DRIVERS = 1
+
 # List of user agents to rotate for stealth
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
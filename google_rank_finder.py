@@ -3,7 +3,7 @@
 import time
 import random
 import logging
-from typing import Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
@@ -27,9 +27,48 @@ DETOUR_SELECTORS = {
 }
 
 SEARCH_INPUT_SELECTOR = "[name='q']"
+CAPTCHA_IFRAME_SELECTOR = 'iframe[title="reCAPTCHA"]'
+
+# Opens Myntra in a background tab without moving WebDriver's focus off the SERP. window.open returns
+# immediately, so the page loads while we "read" the SERP and Phase 2 starts on warm DNS/TLS/HTTP caches.
+WARMUP_TAB_OPEN_SCRIPT = "window.__warmupTab = window.open(arguments[0], '_blank');"
+WARMUP_TAB_CLOSE_SCRIPT = "if (window.__warmupTab) { window.__warmupTab.close(); window.__warmupTab = null; }"
+
+# Returns [[link_element, href], ...] for every result block that has a link, in one WebDriver call.
+# The elements come back as real WebElements so the detour can still use a native click.
+SERP_LINKS_SCRIPT = """
+const resultSelector = arguments[0];
+const linkSelector = arguments[1];
+return Array.from(document.querySelectorAll(resultSelector))
+    .map(block => block.querySelector(linkSelector))
+    .filter(link => link)
+    .map(link => [link, link.href]);
+"""
+
+# Snapshots the SERP in a single WebDriver call: whether the reCAPTCHA iframe is present, plus
+# [{ad, text, href}, ...] for every result block in page order. Only a rendered <h3> counts as a
+# title, so collapsed "People also ask" answers and other hidden blocks never get a rank.
+SERP_SNAPSHOT_SCRIPT = """
+const resultSelector = arguments[0];
+const linkSelector = arguments[1];
+const captchaSelector = arguments[2];
+const isVisible = el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+return {
+    captcha: !!document.querySelector(captchaSelector),
+    results: Array.from(document.querySelectorAll(resultSelector)).map(block => {
+        const h3 = block.querySelector('h3');
+        const link = block.querySelector(linkSelector);
+        return {
+            ad: !!block.querySelector('[data-text-ad]'),
+            text: h3 && isVisible(h3) ? h3.innerText.trim() : '',
+            href: link ? link.href : ''
+        };
+    })
+};
+"""
 
 DELAY_CONFIG = {
-    "typing": {"min": 0.09, "max": 0.22},
+    "after_typing": {"min": 0.4, "max": 0.9},
     "after_page_load": {"min": 2.5, "max": 5.0},
     "serp_read": {"min": 5.0, "max": 8.5},
     "before_next_page": {"min": 2.0, "max": 4.0},
@@ -71,7 +110,7 @@ def handle_captcha(driver: WebDriver, keyword: str) -> bool:
     logging.warning("!!! CAPTCHA DETECTED !!! Pausing script and waiting for manual intervention.")
 
     while time.time() - start_time < config.CAPTCHA_WAIT_TIMEOUT:
-        captcha_elements = driver.find_elements(By.CSS_SELECTOR, 'iframe[title="reCAPTCHA"]')
+        captcha_elements = driver.find_elements(By.CSS_SELECTOR, CAPTCHA_IFRAME_SELECTOR)
         if not captcha_elements:
             logging.info("CAPTCHA solved! Resuming script.")
             return True
@@ -108,12 +147,10 @@ def perform_random_detour(driver: WebDriver, target_url: str):
     try:
         if chosen_detour == 'random_link':
             logging.info(f"...Detour: Clicking a random organic link.")
-            all_results = driver.find_elements(By.CSS_SELECTOR, serp_selectors.RESULT_CONTAINER)
-            non_target_links = [
-                res.find_element(By.CSS_SELECTOR, serp_selectors.LINK_CONTAINER)
-                for res in all_results
-                if target_url not in (res.find_element(By.CSS_SELECTOR, serp_selectors.LINK_CONTAINER).get_attribute('href') or '')
-            ]
+            link_pairs = driver.execute_script(
+                SERP_LINKS_SCRIPT, serp_selectors.RESULT_CONTAINER, serp_selectors.LINK_CONTAINER
+            ) or []
+            non_target_links = [link for link, href in link_pairs if target_url not in (href or '')]
             if non_target_links:
                 random.choice(non_target_links).click()
             else:
@@ -135,7 +172,55 @@ def perform_random_detour(driver: WebDriver, target_url: str):
         logging.error(f"An unexpected error occurred during detour: {e}")
 
 
-def _find_rank_on_current_page(driver: WebDriver, target_url: str, rank_offset: int) -> Tuple[Optional[int], Optional[str]]:
+def find_rank_in_results(results: List[Dict[str, Any]], target_url: str, rank_offset: int) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Scans the result blocks of a SERP snapshot for the target URL and returns its rank and exact URL.
+
+    Args:
+        results: The 'results' list of a SERP snapshot, in page order.
+        target_url: The base domain or URL to search for.
+        rank_offset: The starting rank for the page (e.g., 0 for page 1, 10 for page 2).
+
+    Returns:
+        A tuple of (rank, found_url) if found, otherwise (None, None).
+    """
+    # A clean organic result is a non-ad block with a visible, non-empty <h3> title.
+    clean_organic_results = [block for block in results if not block['ad'] and block['text']]
+
+    for rank, organic_block in enumerate(clean_organic_results, start=1 + rank_offset):
+        actual_url = organic_block['href']
+        if actual_url and target_url in actual_url:
+            logging.info(f"SUCCESS: Found a match for '{target_url}'")
+            return rank, actual_url
+    return None, None
+
+
+def _start_myntra_warmup(driver: WebDriver):
+    """Starts loading the Myntra home page in a background tab. Best effort: failures are only logged."""
+    try:
+        driver.execute_script(WARMUP_TAB_OPEN_SCRIPT, config.MYNTRA_HOME)
+    except Exception as e:
+        logging.warning(f"Could not open the Myntra warm-up tab: {e}")
+
+
+def _stop_myntra_warmup(driver: WebDriver):
+    """Closes the background warm-up tab, if it is still open."""
+    try:
+        driver.execute_script(WARMUP_TAB_CLOSE_SCRIPT)
+    except Exception as e:
+        logging.warning(f"Could not close the Myntra warm-up tab: {e}")
+
+
+def _get_serp_snapshot(driver: WebDriver) -> Dict[str, Any]:
+    """Fetches the CAPTCHA flag and all result blocks of the current SERP in one WebDriver call."""
+    snapshot = driver.execute_script(
+        SERP_SNAPSHOT_SCRIPT, serp_selectors.RESULT_CONTAINER, serp_selectors.LINK_CONTAINER, CAPTCHA_IFRAME_SELECTOR
+    ) or {}
+    return {'captcha': bool(snapshot.get('captcha')), 'results': snapshot.get('results') or []}
+
+
+def _find_rank_on_current_page(driver: WebDriver, target_url: str, rank_offset: int,
+                               serp_snapshot: Optional[Dict[str, Any]] = None) -> Tuple[Optional[int], Optional[str]]:
     """
     Scans the current SERP for the target URL and returns its rank and exact URL.
 
@@ -143,30 +228,17 @@ def _find_rank_on_current_page(driver: WebDriver, target_url: str, rank_offset:
         driver: The active Selenium WebDriver instance.
         target_url: The base domain or URL to search for.
         rank_offset: The starting rank for the current page (e.g., 0 for page 1, 10 for page 2).
+        serp_snapshot: An already fetched snapshot of the page. A fresh one is taken if it is missing
+            or the results had not rendered yet when it was taken.
 
     Returns:
         A tuple of (rank, found_url) if found, otherwise (None, None).
     """
     try:
-        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, serp_selectors.RESULT_CONTAINER)))
-        all_potential_blocks = driver.find_elements(By.CSS_SELECTOR, serp_selectors.RESULT_CONTAINER)
-        clean_organic_results = []
-        for block in all_potential_blocks:
-            try:
-                if block.find_elements(By.CSS_SELECTOR, "[data-text-ad]"): continue
-                h3_element = block.find_element(By.CSS_SELECTOR, "h3")
-                if not h3_element.text.strip(): continue
-                clean_organic_results.append(block)
-            except NoSuchElementException: continue
-
-        for rank, organic_block in enumerate(clean_organic_results, start=1 + rank_offset):
-            try:
-                link_element = organic_block.find_element(By.CSS_SELECTOR, serp_selectors.LINK_CONTAINER)
-                actual_url = link_element.get_attribute('href')
-                if actual_url and target_url in actual_url:
-                    logging.info(f"SUCCESS: Found a match for '{target_url}'")
-                    return rank, actual_url
-            except NoSuchElementException: continue
+        if serp_snapshot is None or not serp_snapshot['results']:
+            WebDriverWait(driver, 5, poll_frequency=1.0).until(EC.presence_of_element_located((By.CSS_SELECTOR, serp_selectors.RESULT_CONTAINER)))
+            serp_snapshot = _get_serp_snapshot(driver)
+        return find_rank_in_results(serp_snapshot['results'], target_url, rank_offset)
     except Exception as e:
         logging.error(f"An error occurred while scraping the current page: {e}")
     return None, None
@@ -191,9 +263,9 @@ def find_google_rank(driver: WebDriver, keyword: str, target_url: str) -> Tuple[
 
         search_box = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, SEARCH_INPUT_SELECTOR)))
         search_box.clear()
-        for char in keyword:
-            search_box.send_keys(char)
-            time.sleep(random.uniform(DELAY_CONFIG["typing"]["min"], DELAY_CONFIG["typing"]["max"]))
+        # One send_keys call types the whole keyword in a single WebDriver round-trip.
+        search_box.send_keys(keyword)
+        time.sleep(random.uniform(DELAY_CONFIG["after_typing"]["min"], DELAY_CONFIG["after_typing"]["max"]))
         search_box.send_keys(Keys.RETURN)
         time.sleep(random.uniform(DELAY_CONFIG["after_page_load"]["min"], DELAY_CONFIG["after_page_load"]["max"]))
 
@@ -203,13 +275,19 @@ def find_google_rank(driver: WebDriver, keyword: str, target_url: str) -> Tuple[
         current_rank_offset = 0
         for page_num in range(1, MAX_PAGES_TO_SCRAPE + 1):
             logging.info(f"--- Scraping Page {page_num} for '{keyword}' (simulating reading) ---")
+            # Use the reading pause to warm up the connection to Myntra for Phase 2.
+            _start_myntra_warmup(driver)
             time.sleep(random.uniform(DELAY_CONFIG["serp_read"]["min"], DELAY_CONFIG["serp_read"]["max"]))
+            _stop_myntra_warmup(driver)
 
-            if driver.find_elements(By.CSS_SELECTOR, 'iframe[title="reCAPTCHA"]'):
+            # One snapshot serves both the CAPTCHA check and the rank scan.
+            serp_snapshot = _get_serp_snapshot(driver)
+            if serp_snapshot['captcha']:
                 if not handle_captcha(driver, keyword):
                     break  # Abort this keyword if CAPTCHA times out
+                serp_snapshot = None  # The page changed once the CAPTCHA was solved
 
-            rank_on_page, url_on_page = _find_rank_on_current_page(driver, target_url, current_rank_offset)
+            rank_on_page, url_on_page = _find_rank_on_current_page(driver, target_url, current_rank_offset, serp_snapshot)
             if rank_on_page is not None and url_on_page is not None:
                 logging.info(f"Found at Rank {rank_on_page} on page {page_num}. URL: {url_on_page}")
                 return str(rank_on_page), url_on_page
@@ -4,13 +4,14 @@ import time
 import random
 import logging
 import os
-import pandas as pd
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import smtplib
+import queue
+import shutil
+import threading
+import urllib3
 import traceback
-from email.mime.text import MIMEText
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -18,17 +19,41 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, InvalidSessionIdException
 
 import config
 from google_rank_finder import find_google_rank
-from page_optimizer import analyze_myntra_page, perform_internal_search
+from page_optimizer import (
+    analyze_myntra_page, perform_internal_search,
+    DELETION_SELECTOR, PRODUCT_COUNT_SELECTOR, SEO_CONTAINER_SELECTOR,
+)
+
+# Heavy or rarely used libraries (gspread, oauth2client, webdriver-manager, smtplib)
+# are imported inside the functions that need them, which keeps start-up fast.
+if TYPE_CHECKING:
+    import gspread
+
+# Keep webdriver-manager quiet; its driver cache stays in the shared default location.
+os.environ["WDM_LOG_LEVEL"] = "0"
 
 # --- CONFIGURATION ---
 AUTOMATOR_WORKSHEET_NAME = "kwd optimization"
-FALLBACK_URL = "https://www.myntra.com"
+FALLBACK_URL = config.MYNTRA_HOME
 # --- NEW: Name of the column to track progress ---
 STATUS_COLUMN_NAME = "Processing Status"
+# Resources that are never needed for rank / title / meta / content extraction.
+# They are blocked in the browser so every page load downloads fewer bytes.
+# Images are only blocked by extension, never browser-wide: reCAPTCHA image challenges load their
+# tiles from /recaptcha/api2/payload (no extension), and a person must be able to see them.
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.webp", "*.gif", "*.svg",
+    "*.woff", "*.woff2", "*.ttf",
+    "*googlesyndication*", "*doubleclick*", "*google-analytics*",
+    "*/assets.myntassets.com/*.jpg*",
+]
+# Connections kept open between Selenium and chromedriver. urllib3's default of 1 makes
+# overlapping commands drop and reopen the TCP connection ("Connection pool is full").
+WEBDRIVER_CONNECTION_POOL_SIZE = 16
 
 
 # --- LOGGING & EMAIL FUNCTIONS ---
@@ -43,6 +68,9 @@ def send_error_email(subject: str, body: str):
     """Sends an email notification for critical errors or alerts."""
     if not config.ENABLE_EMAIL_NOTIFICATIONS:
         return
+    import smtplib
+    from email.mime.text import MIMEText
+
     recipients: List[str] = config.RECIPIENT_EMAIL
     logging.info(f"Preparing to send email alert to: {', '.join(recipients)}")
     try:
@@ -59,26 +87,149 @@ def send_error_email(subject: str, body: str):
         logging.critical(f"CRITICAL: FAILED TO SEND EMAIL ALERT. Error: {e}")
 
 # --- HELPER & SETUP FUNCTIONS ---
-def get_humanlike_driver() -> webdriver.Chrome:
+def get_profile_path(worker_index: int) -> str:
+    """Returns the Chrome profile folder for a pool worker. Each running Chrome needs its own folder."""
+    if worker_index == 0:
+        return config.CHROME_PROFILE_PATH
+    return config.CHROME_PROFILE_PATH + f"_{worker_index}"
+
+def prepare_worker_profile(worker_index: int):
+    """
+    Creates a worker's profile folder as a copy of the signed-in master profile, if it doesn't exist yet.
+    Must run before any Chrome is started, so the master profile isn't copied while it is in use.
+    The copy is made in a temporary folder and renamed into place, so an interrupted copy is never
+    mistaken for a finished profile on the next run.
+    """
+    profile_path = get_profile_path(worker_index)
+    if worker_index == 0 or os.path.exists(profile_path):
+        return
+    if not os.path.exists(config.CHROME_PROFILE_PATH):
+        logging.warning(f"Master profile not found at {config.CHROME_PROFILE_PATH}. Worker {worker_index} starts with an empty profile.")
+        return
+    logging.info(f"Copying the master profile to {profile_path}")
+    temp_path = profile_path + ".tmp"
+    if os.path.exists(temp_path):
+        shutil.rmtree(temp_path)  # Left over from an interrupted copy
+    # Chrome's Singleton* files mark a profile as in use; they must not be carried over.
+    # The caches are large, rebuilt by Chrome on demand and not needed to stay signed in.
+    shutil.copytree(
+        config.CHROME_PROFILE_PATH, temp_path,
+        ignore=shutil.ignore_patterns("Singleton*", "lockfile", "Cache", "Code Cache", "GPUCache"),
+    )
+    os.replace(temp_path, profile_path)
+
+@lru_cache(maxsize=None)
+def get_chromedriver_path() -> str:
+    """Resolves the chromedriver binary once per run; every new or respawned driver reuses the path."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+def is_driver_alive(driver: webdriver.Chrome) -> bool:
+    """Pings the browser session with a cheap command. False if the session or Chrome itself is gone."""
+    try:
+        driver.execute_script("return 1;")
+        return True
+    except Exception:
+        return False
+
+def get_humanlike_driver(profile_path: str = config.CHROME_PROFILE_PATH) -> webdriver.Chrome:
     """Initializes and returns a configured, human-like Selenium WebDriver."""
-    logging.info("Initializing human-like Chrome WebDriver...")
+    logging.info(f"Initializing human-like Chrome WebDriver with profile: {profile_path}")
     options = Options()
     random_user_agent = random.choice(config.USER_AGENTS)
     logging.info(f"Using User-Agent: {random_user_agent}")
     options.add_argument(f'user-agent={random_user_agent}')
-    options.add_argument(f"--user-data-dir={config.CHROME_PROFILE_PATH}")
+    options.add_argument(f"--user-data-dir={profile_path}")
     options.add_argument("--no-first-run")
     options.add_argument("--disable-infobars")
     options.add_argument("--disable-extensions")
+    # Skip GPU compositing and background browser traffic. Images are deliberately not disabled here
+    # (see BLOCKED_URL_PATTERNS): a CAPTCHA image challenge must stay solvable by a person.
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-features=TranslateUI,AutofillServerCommunication")
+    # driver.get() returns at DOMContentLoaded; every step that needs content has its own explicit wait.
+    options.page_load_strategy = "eager"
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
-    service = Service(ChromeDriverManager().install())
+    service = Service(get_chromedriver_path())
     driver = webdriver.Chrome(service=service, options=options)
+    driver.command_executor._conn = urllib3.PoolManager(maxsize=WEBDRIVER_CONNECTION_POOL_SIZE)
     driver.set_page_load_timeout(60)
+    # All waits in this project are explicit WebDriverWaits; an implicit wait would compound with them.
+    driver.implicitly_wait(0)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
     return driver
 
-def connect_to_google_sheets() -> gspread.Client:
+class BrowserPool:
+    """
+    A fixed-size pool of human-like Chrome drivers shared by the worker threads.
+    A driver that breaks is invalidated: it is quit and replaced with a fresh one on the same profile,
+    while the other drivers keep working.
+    """
+
+    def __init__(self, size: int):
+        self._idle: "queue.Queue[webdriver.Chrome]" = queue.Queue()
+        self._profile_paths: Dict[webdriver.Chrome, str] = {}
+        self._lock = threading.Lock()
+        for worker_index in range(size):
+            prepare_worker_profile(worker_index)
+        for worker_index in range(size):
+            self._spawn(get_profile_path(worker_index))
+
+    def _spawn(self, profile_path: str):
+        driver = get_humanlike_driver(profile_path)
+        with self._lock:
+            self._profile_paths[driver] = profile_path
+        self._idle.put(driver)
+
+    def acquire(self) -> webdriver.Chrome:
+        """Waits for a free driver. Raises RuntimeError if every driver was lost and none could be respawned."""
+        while True:
+            try:
+                return self._idle.get(timeout=5)
+            except queue.Empty:
+                with self._lock:
+                    if not self._profile_paths:
+                        raise RuntimeError("No browsers left in the pool.")
+
+    def release(self, driver: webdriver.Chrome):
+        """Returns a healthy driver to the pool."""
+        self._idle.put(driver)
+
+    def invalidate(self, driver: webdriver.Chrome):
+        """Quits a broken driver and starts a replacement on the same Chrome profile."""
+        with self._lock:
+            profile_path = self._profile_paths.pop(driver)
+        logging.warning(f"Replacing the browser that uses profile: {profile_path}")
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Could not quit the broken WebDriver cleanly: {e}")
+        try:
+            self._spawn(profile_path)
+        except Exception as e:
+            # The pool just shrinks by one; acquire() raises once no browsers are left at all.
+            logging.error(f"Could not start a replacement browser for profile {profile_path}: {e}")
+
+    def close(self):
+        """Quits every driver in the pool."""
+        with self._lock:
+            drivers = list(self._profile_paths)
+            self._profile_paths.clear()
+        for driver in drivers:
+            logging.info("Closing WebDriver.")
+            try:
+                driver.quit()
+            except Exception as e:
+                logging.warning(f"Could not quit a WebDriver cleanly: {e}")
+
+def connect_to_google_sheets() -> "gspread.Client":
     """Connects to the Google Sheets API and returns the client object."""
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
     logging.info("Connecting to Google Sheets API...")
     scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
     creds = ServiceAccountCredentials.from_json_keyfile_name(config.GCP_CREDENTIALS_PATH, scope)
@@ -86,14 +237,96 @@ def connect_to_google_sheets() -> gspread.Client:
     logging.info("Successfully connected to Google Sheets API.")
     return client
 
-def get_data_from_sheet(worksheet: gspread.Worksheet) -> pd.DataFrame:
-    """Fetches all data from a worksheet and returns it as a DataFrame."""
+def get_data_from_sheet(worksheet: "gspread.Worksheet") -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Fetches all data from a worksheet in a single API call.
+    Returns the rows as {header: value} dicts together with the header row, so the headers don't need a second request.
+    """
     logging.info(f"Fetching data from worksheet: '{worksheet.title}'")
-    records = worksheet.get_all_records()
-    df = pd.DataFrame(records)
-    df['original_index'] = df.index + 2
-    logging.info(f"Successfully fetched {len(df)} keywords.")
-    return df
+    all_values = worksheet.get_all_values()
+    headers = all_values[0] if all_values else []
+    rows = []
+    # +2 because sheet rows are 1-indexed and row 1 holds the headers
+    for sheet_row_index, values in enumerate(all_values[1:], start=2):
+        row = dict(zip(headers, values))
+        row['original_index'] = sheet_row_index
+        rows.append(row)
+    logging.info(f"Successfully fetched {len(rows)} keywords.")
+    return rows, headers
+
+def process_row(driver: webdriver.Chrome, row: Dict[str, Any], position: int, total: int,
+                worksheet: "gspread.Worksheet", sheet_lock: threading.Lock,
+                status_col_index: Optional[int]):
+    """Runs the full rank + on-page analysis pipeline for one keyword row and writes the results."""
+    keyword = str(row.get('Keyword', '')).strip()
+    target_url = str(row.get('Company1', '')).strip()
+    original_row_index = row['original_index']
+
+    logging.info(f"\n{'='*80}\n>>> PROCESSING {position}/{total}: '{keyword}' (Sheet Row: {original_row_index})\n{'='*80}")
+
+    if not keyword or not target_url:
+        logging.warning(f"Skipping row {original_row_index} due to missing Keyword or Company1 URL.")
+        return
+
+    # --- Phase 1: Google Ranking ---
+    found_rank, ranking_url = find_google_rank(driver, keyword, target_url)
+
+    if ranking_url:
+        start_url_for_analysis = ranking_url
+    else:
+        start_url_for_analysis = FALLBACK_URL
+
+    # --- Phase 2: On-Page SEO Analysis ---
+    page_to_analyze = perform_internal_search(driver, keyword, start_url_for_analysis)
+
+    # Analysis must run on the cleaned URL itself. The reload is only skipped when the browser is already
+    # there with no query string (the search result page at '...?rawQuery=...' can differ from it).
+    if driver.current_url.split('#')[0].rstrip('/') != page_to_analyze.rstrip('/'):
+        logging.info(f"Re-navigating to the cleaned URL for analysis: {page_to_analyze}")
+        driver.get(page_to_analyze)
+    else:
+        logging.info(f"Already on the cleaned URL, analyzing without reloading: {page_to_analyze}")
+    # <body> exists almost immediately; wait for one of the elements the analysis actually reads instead.
+    ready_selectors = f"{PRODUCT_COUNT_SELECTOR}, {DELETION_SELECTOR}, {SEO_CONTAINER_SELECTOR}"
+    try:
+        WebDriverWait(driver, 15, poll_frequency=0.75).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ready_selectors))
+        )
+    except TimeoutException:
+        logging.warning("None of the analysis elements appeared within 15 seconds. Analyzing the page as it is.")
+
+    analysis_result = analyze_myntra_page(driver, keyword, page_to_analyze)
+
+    # --- Phase 3: Final Sheet Update ---
+    analysis_status = analysis_result.get('status')
+
+    # Only one of the three opportunity columns gets a value; the other two are cleared.
+    row_updates = {
+        3: found_rank,
+        4: ranking_url,
+        5: keyword if analysis_status == 'Deletion' else "",
+        6: page_to_analyze if analysis_status == 'T&M' else "",
+        7: page_to_analyze if analysis_status == 'Content' else "",
+    }
+    # --- NEW: Mark the row as 'Completed' after all work is done ---
+    if status_col_index:
+        row_updates[status_col_index] = 'Completed'
+
+    from gspread.utils import rowcol_to_a1
+
+    # All cells of the row go out in one request; gspread is not thread-safe, so writes share a lock.
+    updates = [
+        {"range": rowcol_to_a1(original_row_index, col), "values": [[value]]}
+        for col, value in row_updates.items()
+    ]
+    with sheet_lock:
+        worksheet.batch_update(updates, value_input_option="USER_ENTERED")
+    logging.info(f"Updated Sheet [Rankings, Ranking URL, Opportunity] for row {original_row_index}.")
+    if status_col_index:
+        logging.info(f"Marked row {original_row_index} as 'Completed'.")
+
+    logging.info("Taking a break before the next keyword...")
+    time.sleep(random.uniform(12.0, 22.0))
 
 # --- MAIN EXECUTION BLOCK ---
 if __name__ == "__main__":
@@ -101,15 +334,14 @@ if __name__ == "__main__":
 #    os.system("taskkill /F /IM chrome.exe >nul 2>&1")
     time.sleep(3)
     logging.info(f"--- Starting SEO Opportunity Automator for worksheet '{AUTOMATOR_WORKSHEET_NAME}' ---")
-    driver = None
+    browser_pool: Optional[BrowserPool] = None
     try:
         gspread_client = connect_to_google_sheets()
         sheet = gspread_client.open(config.SHEET_NAME)
         worksheet = sheet.worksheet(AUTOMATOR_WORKSHEET_NAME)
-        df = get_data_from_sheet(worksheet)
+        rows, headers = get_data_from_sheet(worksheet)
         
         # --- NEW: Get the column index for the status column ---
-        headers = worksheet.row_values(1)
         status_col_index: Optional[int] = None
         try:
             # +1 because gspread is 1-indexed
@@ -120,67 +352,50 @@ if __name__ == "__main__":
             logging.error("Please add this column to your Google Sheet and restart the script.")
             exit() # Exit the script if the column is missing
 
-        driver = get_humanlike_driver()
-
-        for i, (df_index, row) in enumerate(df.iterrows()):
-            keyword = str(row.get('Keyword', '')).strip()
-            target_url = str(row.get('Company1', '')).strip()
-            original_row_index = row['original_index']
-            
-            # --- NEW: Check the status of the row before processing ---
-            status = str(row.get(STATUS_COLUMN_NAME, '')).strip()
-            if status == 'Completed':
-                logging.info(f"Skipping row {original_row_index} ('{keyword}') as it is already marked 'Completed'.")
-                continue
-
-            logging.info(f"\n{'='*80}\n>>> PROCESSING {i+1}/{len(df)}: '{keyword}' (Sheet Row: {original_row_index})\n{'='*80}")
-
-            if not keyword or not target_url:
-                logging.warning(f"Skipping row {original_row_index} due to missing Keyword or Company1 URL.")
-                continue
-
-            # --- Phase 1: Google Ranking ---
-            found_rank, ranking_url = find_google_rank(driver, keyword, target_url)
-            
-            if ranking_url:
-                start_url_for_analysis = ranking_url
-            else:
-                start_url_for_analysis = FALLBACK_URL
-            
-            worksheet.update_cell(original_row_index, 3, found_rank)
-            worksheet.update_cell(original_row_index, 4, ranking_url)
-            logging.info(f"Updated Sheet [Rankings, Ranking URL] for row {original_row_index}.")
-
-            # --- Phase 2: On-Page SEO Analysis ---
-            page_to_analyze = perform_internal_search(driver, keyword, start_url_for_analysis)
-            
-            logging.info(f"Re-navigating to the cleaned URL for analysis: {page_to_analyze}")
-            driver.get(page_to_analyze)
-            WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            analysis_result = analyze_myntra_page(driver, keyword, page_to_analyze)
-            
-            # --- Phase 3: Final Sheet Update ---
-            analysis_status = analysis_result.get('status')
-            
-            worksheet.update_cell(original_row_index, 5, "")
-            worksheet.update_cell(original_row_index, 6, "")
-            worksheet.update_cell(original_row_index, 7, "")
-
-            if analysis_status == 'Deletion':
-                worksheet.update_cell(original_row_index, 5, keyword)
-            elif analysis_status == 'T&M':
-                worksheet.update_cell(original_row_index, 6, page_to_analyze)
-            elif analysis_status == 'Content':
-                worksheet.update_cell(original_row_index, 7, page_to_analyze)
-            
-            # --- NEW: Mark the row as 'Completed' after all work is done ---
-            if status_col_index:
-                worksheet.update_cell(original_row_index, status_col_index, 'Completed')
-                logging.info(f"Marked row {original_row_index} as 'Completed'.")
-
-            logging.info("Taking a break before the next keyword...")
-            time.sleep(random.uniform(12.0, 22.0))
+        # --- Drop rows already marked 'Completed' before any browser is launched ---
+        pending_rows = [row for row in rows if str(row.get(STATUS_COLUMN_NAME, '')).strip() != 'Completed']
+        skipped_count = len(rows) - len(pending_rows)
+        logging.info(f"Skipping {skipped_count} row(s) already marked 'Completed'. {len(pending_rows)} row(s) pending.")
+        if not pending_rows:
+            logging.info("No pending rows to process.")
+            exit()
+
+        # --- Driver pool: each worker borrows a free browser for one row and hands it back ---
+        num_workers = max(1, min(config.PARALLEL_DRIVERS, len(pending_rows)))
+        browser_pool = BrowserPool(num_workers)
+        sheet_lock = threading.Lock()
+        logging.info(f"Processing keywords with {num_workers} parallel browser(s).")
+
+        def run_row(position: int, row: Dict[str, Any]):
+            drv = browser_pool.acquire()
+            healthy = True
+            try:
+                process_row(drv, row, position, len(pending_rows), worksheet, sheet_lock, status_col_index)
+            except Exception as e:
+                # Any per-row failure only costs this row (it stays pending for the next run).
+                # chromedriver dying surfaces as a urllib3 error rather than a WebDriverException,
+                # so the health ping, not the exception type, decides whether the browser is replaced.
+                if isinstance(e, InvalidSessionIdException) or not is_driver_alive(drv):
+                    healthy = False
+                    logging.error(f"Browser session lost on sheet row {row['original_index']}: {e}")
+                else:
+                    logging.error(f"Browser error on sheet row {row['original_index']}, skipping the row: {e}")
+            finally:
+                if healthy:
+                    browser_pool.release(drv)
+                else:
+                    browser_pool.invalidate(drv)
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [executor.submit(run_row, i + 1, row) for i, row in enumerate(pending_rows)]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                # Stop handing out new rows; rows already in progress are allowed to finish.
+                for future in futures:
+                    future.cancel()
+                raise
 
     except Exception as e:
         error_traceback = traceback.format_exc()
@@ -189,7 +404,6 @@ if __name__ == "__main__":
         send_error_email("SEO Automator Alert: SCRIPT CRASHED", email_body)
 
     finally:
-        if driver:
-            logging.info("Closing WebDriver.")
-            driver.quit()
+        if browser_pool:
+            browser_pool.close()
         logging.info("--- SEO Opportunity Automator Script Finished ---")
\ No newline at end of file
@@ -2,14 +2,14 @@
 
 import logging
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 
 # --- SELECTORS FOR MYNTRA PAGE ANALYSIS ---
 INTERNAL_SEARCH_SELECTOR = "input.desktop-searchBar"
@@ -17,6 +17,27 @@ DELETION_SELECTOR = "span.title-corrections"
 PRODUCT_COUNT_SELECTOR = "span.title-count"
 SEO_CONTAINER_SELECTOR = "div.index-seoContainer"
 
+# First number in a text, allowing thousands separators (e.g. "1,234")
+_DIGITS_RE = re.compile(r'\d[\d,]*')
+
+# Collects every signal the analysis funnel needs in one WebDriver call.
+# Missing elements come back as null (None) so the checks can tell "missing" from "empty".
+PAGE_SIGNALS_SCRIPT = """
+const deletionSelector = arguments[0];
+const countSelector = arguments[1];
+const seoSelector = arguments[2];
+const meta = document.querySelector('meta[name="description"]');
+const count = document.querySelector(countSelector);
+const seo = document.querySelector(seoSelector);
+return {
+    deletion: !!document.querySelector(deletionSelector),
+    title: document.title,
+    meta: meta ? (meta.getAttribute('content') || '') : null,
+    countText: count ? count.innerText : null,
+    seoText: seo ? seo.innerText : null
+};
+"""
+
 
 def perform_internal_search(driver: WebDriver, keyword: str, start_url: str) -> str:
     """
@@ -33,7 +54,7 @@ def perform_internal_search(driver: WebDriver, keyword: str, start_url: str) ->
     logging.info(f"Performing internal search for '{keyword}' starting from {start_url}")
     try:
         driver.get(start_url)
-        search_bar = WebDriverWait(driver, 15).until(
+        search_bar = WebDriverWait(driver, 15, poll_frequency=1.0).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, INTERNAL_SEARCH_SELECTOR))
         )
         search_bar.clear()
@@ -43,8 +64,9 @@ def perform_internal_search(driver: WebDriver, keyword: str, start_url: str) ->
         # --- FIX: More robust wait condition ---
         # Wait for either the product count (success) or the corrections message (no results) to appear.
         # This confirms the search results page has loaded before we get the URL.
+        # Myntra result pages take several seconds to render, so poll less often than the 0.5s default.
         wait_for_selectors = f"{PRODUCT_COUNT_SELECTOR}, {DELETION_SELECTOR}"
-        WebDriverWait(driver, 15).until(
+        WebDriverWait(driver, 15, poll_frequency=1.5).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, wait_for_selectors))
         )
         
@@ -61,125 +83,126 @@ def perform_internal_search(driver: WebDriver, keyword: str, start_url: str) ->
         return start_url.split('?')[0]
 
 
-def check_for_deletion(driver: WebDriver) -> bool:
+def collect_page_signals(driver: WebDriver) -> Optional[Dict[str, Any]]:
     """
-    Checks if the page is a 'no results' page, indicating the keyword should be deleted.
+    Reads the deletion marker, title, meta description, product count text and SEO text in one call.
 
     Args:
         driver: The active Selenium WebDriver instance.
 
     Returns:
-        True if the deletion indicator is found, False otherwise.
+        A dictionary with the keys 'deletion', 'title', 'meta', 'countText' and 'seoText',
+        or None if the page could not be read.
     """
     try:
-        if driver.find_elements(By.CSS_SELECTOR, DELETION_SELECTOR):
-            logging.warning("DELETION CHECK: Found 'no results' indicator. Keyword should be deleted.")
-            return True
+        return driver.execute_script(PAGE_SIGNALS_SCRIPT, DELETION_SELECTOR, PRODUCT_COUNT_SELECTOR, SEO_CONTAINER_SELECTOR)
     except Exception as e:
-        logging.error(f"Error during deletion check: {e}")
+        logging.error(f"Error while reading the page signals: {e}")
+        return None
+
+
+def check_for_deletion(signals: Dict[str, Any]) -> bool:
+    """
+    Checks if the page is a 'no results' page, indicating the keyword should be deleted.
+
+    Args:
+        signals: The page signals from collect_page_signals.
+
+    Returns:
+        True if the deletion indicator is found, False otherwise.
+    """
+    if signals.get('deletion'):
+        logging.warning("DELETION CHECK: Found 'no results' indicator. Keyword should be deleted.")
+        return True
     return False
 
 
-def check_for_tm_optimization(driver: WebDriver) -> bool:
+def check_for_tm_optimization(signals: Dict[str, Any]) -> bool:
     """
     Checks for basic Title & Meta description optimization issues.
 
     Args:
-        driver: The active Selenium WebDriver instance.
+        signals: The page signals from collect_page_signals.
 
     Returns:
         True if any T&M issue is found, False otherwise.
     """
-    try:
-        # 1. Check for missing title or meta description
-        title = driver.title
-        if not title:
-            logging.warning("T&M CHECK: Page <title> is missing.")
-            return True
-
-        try:
-            meta_desc_element = driver.find_element(By.CSS_SELECTOR, 'meta[name="description"]')
-            meta_desc = meta_desc_element.get_attribute("content") or ""
-        except NoSuchElementException:
-            logging.warning("T&M CHECK: <meta name='description'> tag is missing.")
-            return True
-
-        # 2. Check for placeholder character in meta description
-        if "✯" in meta_desc:
-            logging.warning("T&M CHECK: Found '✯' character in meta description.")
-            return True
-
-        # 3. Check length constraints
-        title_len = len(title)
-        meta_len = len(meta_desc)
-        if not (45 <= title_len <= 70):
-            logging.warning(f"T&M CHECK: Title length ({title_len}) is outside the 45-70 character range.")
-            return True
-        if not (145 <= meta_len <= 165):
-            logging.warning(f"T&M CHECK: Meta description length ({meta_len}) is outside the 145-165 character range.")
-            return True
+    # 1. Check for missing title or meta description
+    title = signals.get('title') or ""
+    if not title:
+        logging.warning("T&M CHECK: Page <title> is missing.")
+        return True
+
+    meta_desc = signals.get('meta')
+    if meta_desc is None:
+        logging.warning("T&M CHECK: <meta name='description'> tag is missing.")
+        return True
+
+    # 2. Check for placeholder character in meta description
+    if "✯" in meta_desc:
+        logging.warning("T&M CHECK: Found '✯' character in meta description.")
+        return True
+
+    # 3. Check length constraints
+    title_len = len(title)
+    meta_len = len(meta_desc)
+    if not (45 <= title_len <= 70):
+        logging.warning(f"T&M CHECK: Title length ({title_len}) is outside the 45-70 character range.")
+        return True
+    if not (145 <= meta_len <= 165):
+        logging.warning(f"T&M CHECK: Meta description length ({meta_len}) is outside the 145-165 character range.")
+        return True
 
-    except Exception as e:
-        logging.error(f"Error during T&M optimization check: {e}")
     return False
 
 
-def is_product_count_sufficient(driver: WebDriver) -> bool:
+def is_product_count_sufficient(signals: Dict[str, Any]) -> bool:
     """
     Checks if the product count on the page is 13 or more.
 
     Args:
-        driver: The active Selenium WebDriver instance.
+        signals: The page signals from collect_page_signals.
 
     Returns:
         True if product count is >= 13, False otherwise (or if not found).
     """
-    try:
-        count_element = driver.find_element(By.CSS_SELECTOR, PRODUCT_COUNT_SELECTOR)
-        count_text = count_element.text
-        # Use regex to find any number in the string
-        match = re.search(r'\d+', count_text.replace(',', ''))
-        if match:
-            product_count = int(match.group(0))
-            logging.info(f"PRODUCT COUNT CHECK: Found {product_count} items.")
-            if product_count < 13:
-                logging.warning("Product count is less than 13. Stopping analysis for this page.")
-                return False
-            return True
-        else:
-            logging.warning("PRODUCT COUNT CHECK: Could not parse number from count text.")
-            return False
-    except NoSuchElementException:
+    count_text = signals.get('countText')
+    if count_text is None:
         logging.warning("PRODUCT COUNT CHECK: Product count element not found.")
         return False # Treat as insufficient if not found
-    except Exception as e:
-        logging.error(f"Error during product count check: {e}")
+    # Use regex to find any number in the string
+    match = _DIGITS_RE.search(count_text)
+    if match:
+        product_count = int(match.group(0).replace(',', ''))
+        logging.info(f"PRODUCT COUNT CHECK: Found {product_count} items.")
+        if product_count < 13:
+            logging.warning("Product count is less than 13. Stopping analysis for this page.")
+            return False
+        return True
+    else:
+        logging.warning("PRODUCT COUNT CHECK: Could not parse number from count text.")
         return False
 
 
-def check_for_content_optimization(driver: WebDriver) -> bool:
+def check_for_content_optimization(signals: Dict[str, Any]) -> bool:
     """
     Checks for the presence and word count of the main SEO content block.
 
     Args:
-        driver: The active Selenium WebDriver instance.
+        signals: The page signals from collect_page_signals.
 
     Returns:
         True if the content needs optimization, False otherwise.
     """
-    try:
-        seo_container = driver.find_element(By.CSS_SELECTOR, SEO_CONTAINER_SELECTOR)
-        content_text = seo_container.text
-        word_count = len(content_text.split())
-        logging.info(f"CONTENT CHECK: Found SEO container with {word_count} words.")
-        if word_count < 250:
-            logging.warning("CONTENT CHECK: Word count is less than 250.")
-            return True
-    except NoSuchElementException:
+    content_text = signals.get('seoText')
+    if content_text is None:
         logging.warning("CONTENT CHECK: SEO content container not found.")
         return True # Missing container is an optimization issue
-    except Exception as e:
-        logging.error(f"Error during content optimization check: {e}")
+    word_count = len(content_text.split())
+    logging.info(f"CONTENT CHECK: Found SEO container with {word_count} words.")
+    if word_count < 250:
+        logging.warning("CONTENT CHECK: Word count is less than 250.")
+        return True
     return False
 
 
@@ -198,20 +221,26 @@ def analyze_myntra_page(driver: WebDriver, keyword: str, start_url: str) -> Dict
     """
     logging.info(f"--- Starting On-Page Analysis for '{keyword}' ---")
 
+    # Step A: Read every signal in one round-trip; the checks below are plain Python over the result.
+    signals = collect_page_signals(driver)
+    if not signals:
+        logging.warning("Page signals could not be read. Skipping the on-page checks for this page.")
+        return {'status': 'Analysis Error', 'value': 'Page signals could not be read'}
+
     # Step B: Keyword Deletion Check
-    if check_for_deletion(driver):
+    if check_for_deletion(signals):
         return {'status': 'Deletion', 'value': 'Yes'}
 
     # Step C: T&M Optimization Check
-    if check_for_tm_optimization(driver):
+    if check_for_tm_optimization(signals):
         return {'status': 'T&M', 'value': 'Yes'}
 
     # Step D: Product Count Check
-    if not is_product_count_sufficient(driver):
+    if not is_product_count_sufficient(signals):
         return {'status': 'Low Product Count', 'value': 'Analysis stopped due to < 13 products.'}
 
     # Step E: Content Optimization Check
-    if check_for_content_optimization(driver):
+    if check_for_content_optimization(signals):
         return {'status': 'Content', 'value': 'Yes'}
 
     logging.info("All on-page checks passed. Page is considered optimized.")